@@ -1,19 +1,30 @@
+import sys
+from pathlib import Path
 from generator import Generator
 
+EXAMPLE_DIR = Path(__file__).parent
+
 
 class KubernetesGenerator:
-    fixed_class_definitions = {
-        'JSONSchemaProps': open('./special/JSONSchemaProps.py').read()
-    }
 
     def main(self):
+        fixed_class_definitions = {
+            'JSONSchemaProps': EXAMPLE_DIR.joinpath('special/JSONSchemaProps.py').read_text()
+        }
         generator = Generator(
             parent_class_name='YamlDataClass',
             parent_class_package='generator',
-            fixed_class_definitions=self.fixed_class_definitions)
+            fixed_class_definitions=fixed_class_definitions,
+            bind_schemas=True)
 
-        generator.from_file(open('resources/openapiv2.json', 'r'), open('./kubernetes_models.py', 'w'))
+        with open(EXAMPLE_DIR.joinpath('resources/openapiv2.json'), 'r') as openapi_file, \
+                open('./kubernetes_models.py', 'w') as output_file:
+            generator.from_file(openapi_file, output_file)
 
 if __name__ == "__main__":
     kubernetes_generator = KubernetesGenerator()
-    kubernetes_generator.main()
+    try:
+        kubernetes_generator.main()
+    except ValueError as e:
+        print(e)
+        sys.exit(1)
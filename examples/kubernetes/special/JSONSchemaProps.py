@@ -1,24 +1,20 @@
-from dataclasses import asdict
 from generator import YamlDataClass
-import marshmallow_dataclass
-from yaml import safe_load
-from functools import singledispatchmethod
-
-
-def __JSONSchemaProps_alias_keywords__(data: dict) -> dict:
-    data["ref"] = data["$ref"]
-    data["schema"] = data["$schema"]
-    data["x_kubernetes_embedded_resource"] = data["x-kubernetes-embedded-resource"]
-    data["x_kubernetes_int_or_string"] = data["x-kubernetes-int-or-string"]
-    data["x_kubernetes_list_map_keys"] = data["x-kubernetes-list-map-keys"]
-    data["x_kubernetes_list_type"] = data["x-kubernetes-list-type"]
-    data["x_kubernetes_preserve_unknown_fields"] = data["x-kubernetes-preserve-unknown-fields"]
-    data["x_kubernetes_validations"] = data["x-kubernetes-validations"]
-    return data
 
 
 @dataclass
 class JSONSchemaProps(YamlDataClass):
+    key_aliases = {
+        "ref": "$ref",
+        "schema": "$schema",
+        "x_kubernetes_embedded_resource": "x-kubernetes-embedded-resource",
+        "x_kubernetes_int_or_string": "x-kubernetes-int-or-string",
+        "x_kubernetes_list_map_keys": "x-kubernetes-list-map-keys",
+        "x_kubernetes_list_type": "x-kubernetes-list-type",
+        "x_kubernetes_map_type": "x-kubernetes-map-type",
+        "x_kubernetes_preserve_unknown_fields": "x-kubernetes-preserve-unknown-fields",
+        "x_kubernetes_validations": "x-kubernetes-validations",
+    }
+
     ref: str = field(default=None)
     schema: str = field(default=None)
     additionalItems: JSONSchemaPropsOrBool = field(default=None)
@@ -63,32 +59,3 @@ class JSONSchemaProps(YamlDataClass):
     x_kubernetes_map_type: str = field(default=None)
     x_kubernetes_preserve_unknown_fields: bool = field(default=None)
     x_kubernetes_validations: List[ValidationRule] = field(default=None)
-
-    def asdict(self) -> dict:
-        d = asdict(self)
-        d["$ref"] = self.ref
-        d["$schema"] = self.schema
-        d["x-kubernetes-embedded-resource"] = self.x_kubernetes_embedded_resource
-        d["x-kubernetes-int-or-string"] = self.x_kubernetes_int_or_string
-        d["x-kubernetes-list-map-keys"] = self.x_kubernetes_list_map_keys
-        d["x-kubernetes-list-type"] = self.x_kubernetes_map_type
-        d["x-kubernetes-preserve-unknown-fields"] = self.x_kubernetes_preserve_unknown_fields
-        d["x-kubernetes-validations"] = self.x_kubernetes_validations
-        return d
-
-    @singledispatchmethod
-    @classmethod
-    def load(cls, arg) -> YamlDataClass:
-        raise NotImplemented('YamlDataClass.load() only accepts dicts and json strings')
-
-    @load.register
-    @classmethod
-    def _(cls, data: str) -> YamlDataClass:
-        schema = marshmallow_dataclass.class_schema(cls)()
-        return schema.load(__JSONSchemaProps_alias_keywords__(safe_load(data)))
-
-    @load.register
-    @classmethod
-    def _(cls, data: dict) -> YamlDataClass:
-        schema = marshmallow_dataclass.class_schema(cls)()
-        return schema.load(__JSONSchemaProps_alias_keywords__(data))
@@ -1,67 +1,88 @@
-from typing import cast, Self
+import io
+from typing import cast, ClassVar, Dict, Self, TextIO
 import marshmallow_dataclass
-from dataclasses import asdict, is_dataclass
-from functools import singledispatchmethod
-from yaml import safe_load, dump
-import keyword
-from generator.generator import Generator
+from dataclasses import asdict, is_dataclass, fields
+from functools import lru_cache
+from marshmallow import pre_load
+from yaml import load, dump
+from generator.generator import Generator, _YamlLoader, _YamlDumper
+
+
+@lru_cache(maxsize=None)
+def _schema_for(cls):
+    return marshmallow_dataclass.class_schema(cls)()
+
+
+@lru_cache(maxsize=None)
+def _fields_for(cls):
+    return fields(cls)
+
+
+def _project(value):
+    if isinstance(value, YamlDataClass):
+        return value.asdict()
+    if is_dataclass(value) and not isinstance(value, type):
+        return asdict(value)
+    if isinstance(value, list):
+        return [_project(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _project(item) for key, item in value.items()}
+    return value
+
+
+_UNMANGLE_MAP = {mangled: word for word, mangled in Generator._MANGLE_MAP.items()}
 
 
 def __dealias_keywords__(output_dict: dict):
-    for key in output_dict:
-        if key.isupper():
-            match_found = False
-            for kw in list(keyword.kwlist) + Generator.reserved_names:
-                if key.casefold() == kw.casefold():
-                    match_found = True
-                    output_dict[kw] = output_dict[key]
-                    del output_dict[key]
-            if not match_found:
-                raise Exception(f"Unhandled uppercase keyword key: {key.upper()}!")
-    return output_dict
-
-
-def __alias_keywords__(input_dict: dict):
-    for key in input_dict:
-        if keyword.iskeyword(key) or key in Generator.reserved_names:
-            if keyword.iskeyword(key.upper()):
-                raise Exception(f"Unhandled uppercase keyword key: {key.upper()}!")
-            print(f'delete {key}')
-            input_dict[key.upper()] = input_dict[key]
-            del input_dict[key]
-    return input_dict
+    return {_UNMANGLE_MAP.get(key, key): value for key, value in output_dict.items()}
+
+
+@lru_cache(maxsize=None)
+def _field_names_for(cls):
+    return {alias: name for name, alias in cls.key_aliases.items()}
+
+
+def __alias_keywords__(input_dict: dict, field_names: Dict[str, str] = None):
+    field_names = field_names or {}
+    return {field_names.get(key) or Generator.mangle_python_keyword(key): value
+            for key, value in input_dict.items()}
 
 
 class YamlDataClass:
+    # Set on generated classes at import time when the generator runs with bind_schemas=True
+    _SCHEMA: ClassVar = None
+    # Maps field names to the document keys they are serialized as, for keys that are not valid identifiers
+    key_aliases: ClassVar[Dict[str, str]] = {}
 
-    @singledispatchmethod
     @classmethod
     def load(cls, arg) -> Self:
-        raise NotImplemented('YamlDataClass.load() only accepts dicts and json strings')
-
-    @load.register
-    @classmethod
-    def _(cls, data: str) -> Self:
-        if is_dataclass(cls):
-            schema = marshmallow_dataclass.class_schema(cls)()
-            return cast(cls, schema.load(__alias_keywords__(safe_load(data))))
-        else:
-            raise NotImplemented('Only dataclasses should inherit from YamlDataClass!')
+        if not is_dataclass(cls):
+            raise NotImplementedError('Only dataclasses should inherit from YamlDataClass!')
+        if isinstance(arg, str):
+            arg = load(arg, Loader=_YamlLoader)
+        elif not isinstance(arg, dict):
+            raise NotImplementedError('YamlDataClass.load() only accepts dicts and json strings')
+        schema = vars(cls).get('_SCHEMA') or _schema_for(cls)
+        return cast(cls, schema.load(arg))
 
-    @load.register
+    # marshmallow_dataclass copies hooks onto each class's schema, so nested objects are renamed per class too
     @classmethod
-    def _(cls, data: dict) -> Self:
-        if is_dataclass(cls):
-            schema = marshmallow_dataclass.class_schema(cls)()
-            return cast(cls, schema.load(__alias_keywords__(data)))
-        else:
-            raise NotImplemented('Only dataclasses should inherit from YamlDataClass!')
+    @pre_load
+    def _alias_keys(cls, data, **kwargs):
+        return __alias_keywords__(data, _field_names_for(cls))
 
     def asdict(self) -> dict:
         if is_dataclass(self):
-            return __dealias_keywords__(asdict(self))
+            key_aliases = self.key_aliases
+            return __dealias_keywords__({key_aliases.get(f.name, f.name): _project(getattr(self, f.name))
+                                         for f in _fields_for(type(self))})
         else:
-            raise NotImplemented('Only dataclasses should inherit from JsonDataClass!')
+            raise NotImplementedError('Only dataclasses should inherit from YamlDataClass!')
 
     def to_yaml(self) -> str:
-        return dump(self.asdict())
+        buffer = io.StringIO()
+        self.to_yaml_stream(buffer)
+        return buffer.getvalue()
+
+    def to_yaml_stream(self, stream: TextIO) -> None:
+        dump(self.asdict(), stream, Dumper=_YamlDumper)
@@ -1,151 +1,248 @@
+import io
 import yaml
-from typing import Dict, TextIO
+from typing import Dict, Iterable, Optional, TextIO
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
-from enum import Enum
+from enum import IntEnum
+from functools import lru_cache
+from itertools import starmap
+from urllib.request import urlopen
 import keyword
 
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
 
-class DataType(Enum):
+try:
+    from yaml import CSafeLoader as _YamlLoader, CSafeDumper as _YamlDumper
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader, SafeDumper as _YamlDumper
+
+
+_DATACLASS_TEMPLATE = "\n@dataclass\nclass {class_name}{parent}:\n{fields}"
+_FIELD_TEMPLATE = "    {name}: {type} {default}"
+_DEFAULT_NONE = "= field(default=None)"
+# Minimum number of definitions before parallel=True renders them in a process pool
+_PARALLEL_MIN_DEFINITIONS = 100
+_BIND_SCHEMAS_TEMPLATE = """
+
+
+for _c in (
+{class_names}
+):
+    _c._SCHEMA = marshmallow_dataclass.class_schema(_c)()
+del _c
+"""
+
+
+class DataType(IntEnum):
     BASIC = 1
     REF = 2
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ItemType:
     data_type: DataType
     type_string: str = None
 
 
+_TYPE_MAP = {
+    "string": "str",
+    "integer": "int",
+    "number": "float",
+    "boolean": "bool",
+    "array": "List",
+    "object": "Dict",
+}
+
+
+@lru_cache(maxsize=None)
+def _ref_name(ref: str) -> str:
+    # todo: if packages are implemented, use package name here for import
+    return ref.rsplit('/', 1)[-1].rsplit('.', 1)[-1]
+
+
+@lru_cache(maxsize=None)
+def _map_openapi_type(data_type: DataType, type_string: str,
+                      array_data_type: DataType = None, array_type_string: str = None) -> str:
+    if data_type == DataType.REF:
+        return _ref_name(type_string)
+    if type_string == "array":
+        if array_data_type == DataType.REF:
+            return f"List[{_ref_name(array_type_string)}]"
+        return f"List[{_TYPE_MAP.get(array_type_string, 'Any')}]"
+    return _TYPE_MAP.get(type_string, "Any")
+
+
 def map_openapi_type(openapi_type: ItemType, array_type: ItemType = None) -> str:
-    type_mapping = {
-        "string": "str",
-        "integer": "int",
-        "number": "float",
-        "boolean": "bool",
-        "array": "List",
-        "object": "Dict",
-    }
-    if openapi_type.data_type == DataType.REF:
-        ref = openapi_type.type_string.split('/')[-1]
-        ref = ref.split('.')  # todo: if packages are implemented, use package name here for import
-        return ref[-1]
-    if openapi_type.type_string == "array":
-        if array_type.data_type == DataType.REF:
-            array_type_string = array_type.type_string.split('/')[-1]
-            array_type_string = array_type_string.split('.')[-1]
-            return f"List[{array_type_string}]"
-        return f"List[{type_mapping[array_type.type_string]}]"
-    return type_mapping[openapi_type.type_string]
+    if array_type is None:
+        return _map_openapi_type(openapi_type.data_type, openapi_type.type_string)
+    return _map_openapi_type(openapi_type.data_type, openapi_type.type_string,
+                             array_type.data_type, array_type.type_string)
+
+
+@lru_cache(maxsize=None)
+def _get_openapi_type_from_ref_or_type(ref: str, type_string: str) -> ItemType:
+    if ref is not None:
+        return ItemType(data_type=DataType.REF, type_string=ref)
+    elif type_string is not None:
+        return ItemType(data_type=DataType.BASIC, type_string=type_string)
+    return None
+
+
+def _load_spec(raw):
+    # JSON is a subset of YAML, but a JSON parser reads large specs far faster than PyYAML.
+    # A leading "{" is only a hint: YAML flow mappings start with one too.
+    if raw.lstrip()[:1] in ('{', b'{'):
+        try:
+            return _json.loads(raw)
+        except ValueError:
+            pass
+    return yaml.load(raw, Loader=_YamlLoader)
 
 
 class Generator:
-    reserved_names = ['field', 'List', 'Dict', 'Any']
+    reserved_names = ('field', 'List', 'Dict', 'Any')
+    _MANGLE_MAP = {word: word.upper() for word in (*keyword.kwlist, *reserved_names)}
 
     def __init__(self, parent_class_name: str = None, parent_class_package: str = None,
-                 fixed_class_definitions: dict = ()):
+                 fixed_class_definitions: dict = (), bind_schemas: bool = False, parallel: bool = False):
         self.parent_class_name = parent_class_name
         if parent_class_package is not None and parent_class_name is None:
             raise Exception("parent_class_name must be defined if parent_class_package is used")
+        if bind_schemas and parent_class_name is None:
+            raise Exception("parent_class_name must be defined if bind_schemas is used")
         self.parent_class_package = parent_class_package
         self.fixed_class_definitions = fixed_class_definitions
+        # Build each generated class's marshmallow schema once, when the generated module is imported
+        self.bind_schemas = bind_schemas
+        # Render dataclasses in a process pool for large specs. Worker processes re-import the caller's main module
+        # on platforms that use the spawn start method (Windows, macOS), so scripts that generate with parallel=True
+        # must do so under an `if __name__ == "__main__":` guard
+        self.parallel = parallel
 
     # Helper function to map OpenAPI types to Python types
 
-    def get_openapi_type(self, properties: dict) -> ItemType:
-        if "$ref" in properties:
-            return ItemType(data_type=DataType.REF, type_string=properties["$ref"])
-        elif "type" in properties:
-            return ItemType(data_type=DataType.BASIC, type_string=properties["type"])
-        else:
+    @staticmethod
+    def get_openapi_type(properties: dict) -> ItemType:
+        item_type = _get_openapi_type_from_ref_or_type(properties.get("$ref"), properties.get("type"))
+        if item_type is None:
             raise NotImplementedError(f'field properties contains neither a type nor a $ref: {properties}')
+        return item_type
+
+    @staticmethod
+    def mangle_python_keyword(word: str) -> str:
+        return Generator._MANGLE_MAP.get(word, word)
+
+    # Renders one dataclass. Static and free of instance state so it can run in a worker process
+    @staticmethod
+    def _render_dataclass(class_name: str, schema: dict, parent: str) -> str:
+        get_openapi_type = Generator.get_openapi_type
+        mangle = Generator._MANGLE_MAP.get
+        field_template = _FIELD_TEMPLATE.format
+        required_out = []
+        optional_out = []
+        required_fields = frozenset(schema.get("required") or ())
+        properties = schema.get("properties", {})
+
+        for field_name, field_props in properties.items():
+            open_api_type = get_openapi_type(field_props)
+            array_type = None
+            if open_api_type.data_type == DataType.BASIC and open_api_type.type_string == 'array':
+                array_type = get_openapi_type(field_props["items"])
+
+            field_type = map_openapi_type(open_api_type, array_type)
+            required = field_name in required_fields
+            field_definition = field_template(
+                name=mangle(field_name, field_name), type=field_type,
+                default="" if required else _DEFAULT_NONE)
+            if required:
+                required_out.append(field_definition)
+            else:
+                optional_out.append(field_definition)
 
-    def mangle_python_keyword(self, word: str) -> str:
-        if keyword.iskeyword(word) or word in self.reserved_names:
-            return word.upper()
-        return word
+        fields = required_out + optional_out
+
+        return _DATACLASS_TEMPLATE.format(
+            class_name=class_name,
+            parent=parent,
+            fields="\n".join(fields) if fields else "    pass")
 
     # Function to convert OpenAPI definitions to dataclasses
-    def convert_definitions_to_dataclasses(self, definitions: Dict[str, Dict]) -> str:
-        result = []
-        for name, schema in definitions.items():
-            name = name.split('.')
-            class_name = name[-1]
-            package_name = name[:-1]  # todo: create python packages
+    def convert_definitions_to_dataclasses(self, definitions: Dict[str, Dict],
+                                           out: TextIO = None) -> Optional[str]:
+        # Without an output stream the generated code is collected and returned as a string
+        if out is None:
+            buffer = io.StringIO()
+            self.convert_definitions_to_dataclasses(definitions, buffer)
+            return buffer.getvalue()
+
+        parent = f"({self.parent_class_name})" if self.parent_class_name is not None else ""
+        # todo: create python packages
+        class_names = [_ref_name(name) for name in definitions]
+        render_args = [(class_name, schema, parent)
+                       for class_name, schema in zip(class_names, definitions.values())
+                       if class_name not in self.fixed_class_definitions]
+
+        if self.parallel and len(render_args) >= _PARALLEL_MIN_DEFINITIONS:
+            with ProcessPoolExecutor() as executor:
+                rendered = executor.map(self._render_dataclass, *zip(*render_args), chunksize=64)
+                self._write_dataclasses(class_names, rendered, out)
+        else:
+            self._write_dataclasses(class_names, starmap(self._render_dataclass, render_args), out)
+
+        if self.bind_schemas and render_args:
+            out.write(_BIND_SCHEMAS_TEMPLATE.format(
+                class_names="\n".join(f"    {class_name}," for class_name in dict.fromkeys(
+                    class_name for class_name, _, _ in render_args))))
+
+    def _write_dataclasses(self, class_names: Iterable[str], rendered: Iterable[str], out: TextIO):
+        rendered = iter(rendered)
+        separator = ""
+        for class_name in class_names:
+            out.write(separator)
+            separator = "\n\n"
             if class_name in self.fixed_class_definitions:
-                result.append(self.fixed_class_definitions[class_name])
-                continue
-
-            fields = []
-            required_fields = schema.get("required", [])
-            properties = schema.get("properties", {})
-
-            for field_name, field_props in properties.items():
-                open_api_type = self.get_openapi_type(field_props)
-                array_type = None
-                if open_api_type.data_type == DataType.BASIC and open_api_type.type_string == 'array':
-                    array_type = self.get_openapi_type(field_props["items"])
-
-                field_type = map_openapi_type(open_api_type, array_type)
-                default = "= field(default=None)" if field_name not in required_fields else ""
-                if field_name in required_fields:
-                    fields.insert(0, f"    {self.mangle_python_keyword(field_name)}: {field_type} {default}")
-                else:
-                    fields.append(f"    {self.mangle_python_keyword(field_name)}: {field_type} {default}")
-
-            dataclass_definition = [
-                f"\n@dataclass",
-                f"class {class_name}{'(' + self.parent_class_name + ')' if self.parent_class_name is not None else ''}:",
-                "\n".join(fields) if fields else "    pass",
-            ]
-            result.append("\n".join(dataclass_definition))
-
-        return "\n\n".join(result)
+                out.write(self.fixed_class_definitions[class_name])
+            else:
+                out.write(next(rendered))
 
     # Main function to parse the OpenAPI spec and generate dataclasses
     def from_file(self, openapi_file: TextIO, output_file: TextIO):
-        openapi_spec = yaml.safe_load(openapi_file)
+        self._generate(_load_spec(openapi_file.read()), output_file)
 
+    def from_http(self, spec_url: str, output_file: TextIO, timeout: float = 60):
+        with urlopen(spec_url, timeout=timeout) as response:
+            body = response.read()
+        self._generate(_load_spec(body), output_file)
+
+    def from_string(self, openapi_spec: str) -> str:
+        return self._generate(_load_spec(openapi_spec))
+
+    def _generate(self, openapi_spec: dict, output_file: TextIO = None) -> Optional[str]:
         if openapi_spec.get("swagger") != "2.0":
-            print("Only OpenAPI v2 is currently supported")
-            exit(1)
+            raise ValueError("Only OpenAPI v2 is currently supported")
         definitions = openapi_spec.get("definitions", {})
         if not definitions:
             print("No definitions section found in the OpenAPI specification.")
             return
 
-        dataclasses_code = self.convert_definitions_to_dataclasses(definitions)
-
-        output_file.write("from __future__ import annotations\n")
-        output_file.write("from typing import List, Dict, Any\nfrom dataclasses import dataclass, field\n")
+        # Without an output file the generated module is returned as a string
+        out = output_file if output_file is not None else io.StringIO()
+        out.write("from __future__ import annotations\n")
+        out.write("from typing import List, Dict, Any\nfrom dataclasses import dataclass, field\n")
+        if self.bind_schemas:
+            out.write("import marshmallow_dataclass\n")
         if self.parent_class_name:
             if self.parent_class_package:
-                output_file.write(f"from {self.parent_class_package} import {self.parent_class_name}\n")
+                out.write(f"from {self.parent_class_package} import {self.parent_class_name}\n")
             else:
-                output_file.write(f"import {self.parent_class_name}")
+                out.write(f"import {self.parent_class_name}\n")
 
-        output_file.write("\n")
-        output_file.write(dataclasses_code)
+        out.write("\n")
+        self.convert_definitions_to_dataclasses(definitions, out)
 
+        if output_file is None:
+            return out.getvalue()
         print(f"Dataclasses written to {output_file.name}")
-
-    def from_string(self, openapi_spec: str) -> str:
-
-        definitions = yaml.safe_load(openapi_spec).get("definitions", {})
-        if not definitions:
-            print("No definitions section found in the OpenAPI specification.")
-            return
-
-        dataclasses_code = self.convert_definitions_to_dataclasses(definitions)
-
-        imports = f"""
-from __future__ import annotations
-from typing import List, Dict, Any
-from dataclasses import dataclass, field        
-        """
-
-        if self.parent_class_package is not None:
-            imports += f'from {self.parent_class_package} import {self.parent_class_name}'
-        elif self.parent_class_name is not None:
-            imports += f'import {self.parent_class_name}'
-
-        return imports + dataclasses_code
@@ -1,5 +1,10 @@
 from generator import Generator
+from generator.generator import _PARALLEL_MIN_DEFINITIONS
 from types import ModuleType
+import io
+import json
+import tempfile
+from pathlib import Path
 
 ####################################################################
 # This will not compile if wrapped in a function or class due to
@@ -44,3 +49,169 @@ if __name__ == "__main__":
 
     assert user.id == 18081971
     assert user.name == 'Richard D. James'
+
+    # Python keywords in the spec are mangled to upper case and restored on the way out
+    keyword_spec = """
+    swagger: "2.0"
+    definitions:
+      Lecture:
+        properties:
+          class:
+            type: string
+          room:
+            type: string
+        required:
+          - class
+    """
+
+    keyword_generator = Generator(parent_class_name='YamlDataClass', parent_class_package='generator')
+    exec(compile(keyword_generator.from_string(keyword_spec), '', 'exec'))
+    lecture = Lecture.load({'class': 'Analysis', 'room': 'B12'})
+
+    assert lecture.CLASS == 'Analysis'
+    assert lecture.room == 'B12'
+    assert lecture.asdict() == {'class': 'Analysis', 'room': 'B12'}
+
+    lecture_yaml = io.StringIO()
+    lecture.to_yaml_stream(lecture_yaml)
+    assert lecture_yaml.getvalue() == lecture.to_yaml()
+    assert lecture.to_yaml() == 'class: Analysis\nroom: B12\n'
+
+    # Keyword keys are restored at every level, so nested objects round-trip through asdict(). Other upper case
+    # property names are not mangled and pass through unchanged
+    nested_keyword_spec = """
+    swagger: "2.0"
+    definitions:
+      Seminar:
+        properties:
+          class:
+            type: string
+          room:
+            type: string
+          URL:
+            type: string
+      Timetable:
+        properties:
+          first:
+            $ref: "#/definitions/Seminar"
+          seminars:
+            type: array
+            items:
+              $ref: "#/definitions/Seminar"
+    """
+
+    exec(compile(keyword_generator.from_string(nested_keyword_spec), '', 'exec'))
+    timetable = Timetable(first=Seminar(CLASS='Analysis', room='B12'),
+                          seminars=[Seminar(CLASS='Algebra', URL='https://example.org')])
+
+    assert timetable.asdict() == {'first': {'class': 'Analysis', 'room': 'B12', 'URL': None},
+                                  'seminars': [{'class': 'Algebra', 'room': None, 'URL': 'https://example.org'}]}
+    assert Timetable.load(timetable.asdict()) == timetable
+
+    # With bind_schemas the generated module attaches a marshmallow schema to each class at import time
+    bind_schemas_spec = """
+    swagger: "2.0"
+    definitions:
+      Account:
+        properties:
+          id:
+            type: integer
+          owner:
+            type: string
+        required:
+          - id
+    """
+
+    bind_schemas_generator = Generator(parent_class_name='YamlDataClass', parent_class_package='generator',
+                                       bind_schemas=True)
+    exec(compile(bind_schemas_generator.from_string(bind_schemas_spec), '', 'exec'))
+    account = Account.load({'id': 7, 'owner': 'Aphex Twin'})
+
+    assert vars(Account).get('_SCHEMA') is not None
+    assert '_c' not in globals()
+    assert account == Account(id=7, owner='Aphex Twin')
+    assert account.asdict() == {'id': 7, 'owner': 'Aphex Twin'}
+
+    try:
+        Generator(bind_schemas=True)
+        rejected = False
+    except Exception:
+        rejected = True
+    assert rejected, "bind_schemas without parent_class_name should be rejected"
+
+    # A YAML flow mapping starts with "{" like JSON does, but must still be parsed as YAML
+    flow_yaml_spec = '{swagger: "2.0", definitions: {Track: {properties: {title: {type: string}}}}}'
+
+    with tempfile.NamedTemporaryFile('w+', suffix='.py') as flow_yaml_output:
+        Generator().from_file(io.StringIO(flow_yaml_spec), flow_yaml_output)
+        flow_yaml_output.seek(0)
+        exec(compile(flow_yaml_output.read(), '', 'exec'))
+
+    assert Track(title='Windowlicker').title == 'Windowlicker'
+
+    flow_yaml_generated = Generator().from_string(
+        '{swagger: "2.0", definitions: {Single: {properties: {id: {type: integer}}}}}')
+    exec(compile(flow_yaml_generated, '', 'exec'))
+
+    assert Single(id=1999).id == 1999
+
+    json_generated = Generator().from_string(
+        '{"swagger": "2.0", "definitions": {"Album": {"properties": {"name": {"type": "string"}}}}}')
+    exec(compile(json_generated, '', 'exec'))
+
+    assert Album(name='Drukqs').name == 'Drukqs'
+
+    # Fixed class definitions rename keys that are not identifiers through YamlDataClass.key_aliases
+    aliased_definition = """
+from __future__ import annotations
+from dataclasses import dataclass, field
+from generator import YamlDataClass
+
+
+@dataclass
+class Reference(YamlDataClass):
+    key_aliases = {"ref": "$ref"}
+
+    ref: str = field(default=None)
+    title: str = field(default=None)
+"""
+
+    exec(compile(aliased_definition, '', 'exec'))
+    reference = Reference.load('{"$ref": "#/definitions/User", "title": "owner"}')
+
+    assert reference == Reference(ref='#/definitions/User', title='owner')
+    assert reference.asdict() == {'$ref': '#/definitions/User', 'title': 'owner'}
+
+    # from_http reads the spec from any URL urllib can open
+    with tempfile.TemporaryDirectory() as http_dir:
+        http_spec = Path(http_dir, 'spec.yaml')
+        http_spec.write_text(simple_spec.replace('User:', 'Artist:'))
+        http_output = Path(http_dir, 'models.py')
+        with open(http_output, 'w') as output_file:
+            Generator().from_http(http_spec.as_uri(), output_file, timeout=5)
+        exec(compile(http_output.read_text(), '', 'exec'))
+
+    artist = Artist(name='Richard D. James', id=18081971)
+    assert artist.id == 18081971
+
+    # Unsupported spec versions are reported to the caller instead of exiting the interpreter
+    try:
+        Generator().from_string('openapi: "3.0.0"\ncomponents: {schemas: {}}\n')
+        unsupported_rejected = False
+    except ValueError:
+        unsupported_rejected = True
+    assert unsupported_rejected, "OpenAPI v3 specs should raise ValueError"
+
+    # Rendering in a process pool produces exactly the serial output
+    parallel_spec = json.dumps({
+        "swagger": "2.0",
+        "definitions": {
+            f"Track{n}": {
+                "properties": {"id": {"type": "integer"}, "tags": {"type": "array", "items": {"type": "string"}}},
+                "required": ["id"],
+            }
+            for n in range(_PARALLEL_MIN_DEFINITIONS + 10)
+        },
+    })
+
+    assert Generator(parallel=True).from_string(parallel_spec) == Generator().from_string(parallel_spec)